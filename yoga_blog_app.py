@@ -1,14 +1,141 @@
 import streamlit as st
-import json
-from typing import Optional, List, ClassVar, Iterator
-from datetime import datetime
-from pydantic import BaseModel, Field
+import asyncio
+import os
+import re
+import sqlite3
+from functools import lru_cache
+from typing import Optional, List, Iterator
+from pydantic import BaseModel, ConfigDict, Field
 from phi.agent import Agent
 from phi.workflow import Workflow, RunResponse, RunEvent
 from phi.storage.workflow.sqlite import SqlWorkflowStorage
 from phi.model.deepseek import DeepSeekChat
 from phi.utils.log import logger
 
+_DB_FILE = "tmp/workflows.db"
+
+@st.cache_resource
+def _cache_connection() -> sqlite3.Connection:
+    """Open the blog cache table in the workflow database once per process"""
+    os.makedirs(os.path.dirname(_DB_FILE), exist_ok=True)
+    conn = sqlite3.connect(_DB_FILE, check_same_thread=False)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS blog_cache "
+        "(topic TEXT PRIMARY KEY, content TEXT, embedding BLOB, created_at TIMESTAMP)"
+    )
+    try:
+        conn.execute("ALTER TABLE blog_cache ADD COLUMN embedding BLOB")
+    except sqlite3.OperationalError:
+        pass
+    return conn
+
+_SEMANTIC_THRESHOLD = 0.92
+
+def _normalize_topic(topic: str) -> str:
+    """Collapse case and whitespace so near-identical topics share a key"""
+    return re.sub(r'\s+', ' ', topic.strip().lower())
+
+@st.cache_resource
+def _get_embedder():
+    """Load the sentence embedding model once; None disables semantic lookup"""
+    try:
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer("all-MiniLM-L6-v2")
+    except ImportError:
+        logger.info("sentence-transformers not installed; semantic cache disabled")
+        return None
+
+def _embed_topic(topic: str):
+    """Return a unit-norm float32 embedding for the topic, or None"""
+    embedder = _get_embedder()
+    if embedder is None:
+        return None
+    return embedder.encode(topic, normalize_embeddings=True).astype("float32")
+
+def _semantic_lookup(topic: str) -> Optional[str]:
+    """Return the closest cached post if its topic is similar enough"""
+    query = _embed_topic(topic)
+    if query is None:
+        return None
+    import numpy as np
+    rows = _cache_connection().execute(
+        "SELECT content, embedding FROM blog_cache WHERE embedding IS NOT NULL"
+    ).fetchall()
+    if not rows:
+        return None
+    matrix = np.frombuffer(
+        b"".join(row[1] for row in rows), dtype=np.float32
+    ).reshape(len(rows), -1)
+    scores = matrix @ query
+    best = int(scores.argmax())
+    return rows[best][0] if scores[best] > _SEMANTIC_THRESHOLD else None
+
+@lru_cache(maxsize=128)
+def _lookup_blog_post(topic: str) -> Optional[str]:
+    """Read a cached post from SQLite, memoizing hot topics in memory"""
+    row = _cache_connection().execute(
+        "SELECT content FROM blog_cache WHERE topic = ?", (topic,)
+    ).fetchone()
+    if row:
+        return row[0]
+    return _semantic_lookup(topic)
+
+def _store_blog_post(topic: str, content: Optional[str]):
+    """Write a post to the durable cache and drop stale in-memory entries"""
+    vector = _embed_topic(topic)
+    conn = _cache_connection()
+    conn.execute(
+        "INSERT OR REPLACE INTO blog_cache (topic, content, embedding, created_at) "
+        "VALUES (?, ?, ?, CURRENT_TIMESTAMP)",
+        (topic, content, vector.tobytes() if vector is not None else None),
+    )
+    conn.commit()
+    _lookup_blog_post.cache_clear()
+
+@st.cache_resource
+def _get_model() -> DeepSeekChat:
+    """Build the DeepSeek client once, reading the key when first needed"""
+    api_key = os.environ.get("DEEPSEEK_API_KEY") or st.secrets["DEEPSEEK_API_KEY"]
+    return DeepSeekChat(api_key=api_key)
+
+# The writer is instructed to emit exactly these headings, so the response
+# can be chopped into sections with a single C-level regex pass. The
+# pattern swallows the blank lines around each heading so the split
+# bodies come back already trimmed.
+_SPLIT_RE = re.compile(
+    r'\s*^###[^\S\n]+(The Soul Space Perspective|Understanding the Science|'
+    r'Traditional Wisdom[^\n]*?|Practical Applications|Key Takeaways|'
+    r'Scientific References)[^\S\n]*(?:\n\s*|\Z)',
+    re.M,
+)
+_TITLE_RE = re.compile(r'^##[^\S\n]+(.+?)[^\S\n]*$', re.M)
+_ITEM_RE = re.compile(r'(?m)^[-*\d.]+\s*(.+)$')
+_SECTION_FIELDS = {
+    'The Soul Space Perspective': 'perspective',
+    'Understanding the Science': 'science',
+    'Traditional Wisdom Meets Modern Research': 'integration',
+    'Practical Applications': 'applications',
+    'Key Takeaways': 'takeaways',
+    'Scientific References': 'references',
+}
+_LIST_FIELDS = frozenset({'applications', 'takeaways', 'references'})
+_REQUIRED_HEADINGS = (
+    '### The Soul Space Perspective',
+    '### Understanding the Science',
+    '### Traditional Wisdom',
+    '### Practical Applications',
+    '### Key Takeaways',
+    '### Scientific References',
+)
+_SIGNATURE = "\n\nNamaste,\nJen Patel\nFounder, Soul Space"
+
+def _blog_prompt(topic: str) -> str:
+    """Build the writer prompt for a topic"""
+    return f"""Write a comprehensive blog post about {topic}.
+        Focus on both scientific evidence and yogic wisdom.
+        Include recent research and practical applications.
+        Follow the exact structure provided in the instructions."""
+
 class YogaBlogPost(BaseModel):
     """Structure for yoga blog posts"""
     title: str = Field(..., description="Engaging title for the blog post")
@@ -19,50 +146,63 @@ class YogaBlogPost(BaseModel):
     takeaways: List[str] = Field(..., description="Key insights and learnings")
     references: List[str] = Field(..., description="Scientific references")
 
-    class Config:
-        arbitrary_types_allowed = True
+    model_config = ConfigDict(frozen=True, arbitrary_types_allowed=True)
 
-class YogaBlogGenerator(Workflow):
-    """Workflow for generating yoga blog posts"""
-    description: str = "Generate scientifically-backed yoga content"
-    
-    writer: ClassVar[Agent] = Agent(
-        model=DeepSeekChat(api_key='sk-ada27ff0f9ec45d7adf152ceb9c18da7'),
+_WRITER_INSTRUCTIONS: tuple = (
+    "Create engaging 1000+ word content that balances scientific accuracy with accessibility",
+    "Include peer-reviewed research citations",
+    "Structure with clear sections using markdown",
+    "Add practical tips for Soul Space students",
+    "End with key takeaways and references",
+    """Use this exact structure:
+    ## [Title]
+    ### The Soul Space Perspective
+    [Content]
+    ### Understanding the Science
+    [Content]
+    ### Traditional Wisdom Meets Modern Research
+    [Content]
+    ### Practical Applications
+    - [Tips]
+    ### Key Takeaways
+    - [Points]
+    ### Scientific References
+    1. [References]""",
+)
+
+@lru_cache(maxsize=1)
+def _get_writer() -> Agent:
+    """Build the writer agent once, shared by every workflow instance"""
+    return Agent(
+        model=_get_model(),
         description="Soul Space's wellness researcher creating scientifically-backed yoga content.",
-        instructions=[
-            "Create engaging 1000+ word content that balances scientific accuracy with accessibility",
-            "Include peer-reviewed research citations",
-            "Structure with clear sections using markdown",
-            "Add practical tips for Soul Space students",
-            "End with key takeaways and references",
-            """Use this exact structure:
-            ## [Title]
-            ### The Soul Space Perspective
-            [Content]
-            ### Understanding the Science
-            [Content]
-            ### Traditional Wisdom Meets Modern Research
-            [Content]
-            ### Practical Applications
-            - [Tips]
-            ### Key Takeaways
-            - [Points]
-            ### Scientific References
-            1. [References]"""
-        ],
+        instructions=list(_WRITER_INSTRUCTIONS),
         markdown=True
     )
 
+class YogaBlogGenerator(Workflow):
+    """Workflow for generating yoga blog posts"""
+    description: str = "Generate scientifically-backed yoga content"
+
+    @property
+    def writer(self) -> Agent:
+        """Writer agent, built lazily on first use and shared process-wide"""
+        return _get_writer()
+
+    @classmethod
+    def peek_cache(cls, topic: str) -> Optional[str]:
+        """Look up a cached post without building a workflow instance"""
+        return _lookup_blog_post(_normalize_topic(topic))
+
     def get_cached_blog_post(self, topic: str) -> Optional[str]:
         """Check if blog post exists in cache"""
         logger.info("Checking cache for existing blog post")
-        return self.session_state.get("yoga_blogs", {}).get(topic)
+        return _lookup_blog_post(_normalize_topic(topic))
 
     def add_blog_post_to_cache(self, topic: str, blog_post: Optional[str]):
         """Save blog post to cache"""
         logger.info(f"Caching blog post for: {topic}")
-        self.session_state.setdefault("yoga_blogs", {})
-        self.session_state["yoga_blogs"][topic] = blog_post
+        _store_blog_post(_normalize_topic(topic), blog_post)
 
     def parse_response(self, content: str) -> YogaBlogPost:
         """Parse the response into sections"""
@@ -75,88 +215,56 @@ class YogaBlogGenerator(Workflow):
             'takeaways': [],
             'references': []
         }
-        current_section = None
-        current_text = []
-        
-        for line in content.split('\n'):
-            line = line.strip()
-            if not line:
-                continue
-                
-            if line.startswith('## '):
-                sections['title'] = line.replace('## ', '')
-            elif line.startswith('### The Soul Space Perspective'):
-                if current_section and current_text:
-                    sections[current_section] = '\n'.join(current_text)
-                current_section = 'perspective'
-                current_text = []
-            elif line.startswith('### Understanding the Science'):
-                if current_section and current_text:
-                    sections[current_section] = '\n'.join(current_text)
-                current_section = 'science'
-                current_text = []
-            elif line.startswith('### Traditional Wisdom'):
-                if current_section and current_text:
-                    sections[current_section] = '\n'.join(current_text)
-                current_section = 'integration'
-                current_text = []
-            elif line.startswith('### Practical Applications'):
-                if current_section and current_text:
-                    sections[current_section] = '\n'.join(current_text)
-                current_section = 'applications'
-                current_text = []
-            elif line.startswith('### Key Takeaways'):
-                if current_section == 'applications':
-                    sections['applications'] = [t.strip('- ') for t in current_text if t.strip('- ')]
-                current_section = 'takeaways'
-                current_text = []
-            elif line.startswith('### Scientific References'):
-                if current_section == 'takeaways':
-                    sections['takeaways'] = [t.strip('- ') for t in current_text if t.strip('- ')]
-                current_section = 'references'
-                current_text = []
-            elif not line.startswith('Namaste,'):
-                if current_section in ['applications', 'takeaways', 'references']:
-                    if line.startswith('- ') or line.startswith('* ') or line[0].isdigit():
-                        current_text.append(line.lstrip('- *0123456789. '))
-                else:
-                    current_text.append(line)
-
-        # Handle the last section
-        if current_section == 'references' and current_text:
-            sections['references'] = [t for t in current_text if t]
-
-        # Ensure we have at least empty lists/strings for all fields
-        sections = {k: v if v else ([] if k in ['applications', 'takeaways', 'references'] else '') 
-                   for k, v in sections.items()}
-
-        return YogaBlogPost(**sections)
+        # One split yields [preamble, heading, body, heading, body, ...]
+        parts = _SPLIT_RE.split(content)
+        title_match = _TITLE_RE.search(parts[0])
+        if title_match:
+            sections['title'] = title_match.group(1)
 
-    def format_blog_post(self, blog: YogaBlogPost) -> str:
-        """Format blog post in Soul Space style"""
-        return f"""## {blog.title}
-
-### The Soul Space Perspective
-{blog.perspective}
-
-### Understanding the Science
-{blog.science}
-
-### Traditional Wisdom Meets Modern Research
-{blog.integration}
+        for heading, body in zip(parts[1::2], parts[2::2]):
+            field = _SECTION_FIELDS.get(heading, 'integration')
+            if field in _LIST_FIELDS:
+                sections[field] = _ITEM_RE.findall(body)
+            else:
+                sections[field] = body
 
-### Practical Applications
-{chr(10).join(f"- {tip}" for tip in blog.applications)}
+        # Backfill empty list fields in place; string fields already default to ''
+        for key in _LIST_FIELDS:
+            if not sections[key]:
+                sections[key] = []
 
-### Key Takeaways
-{chr(10).join(f"- {takeaway}" for takeaway in blog.takeaways)}
+        # The parser guarantees the field types, so skip Pydantic validation
+        return YogaBlogPost.model_construct(**sections)
 
-### Scientific References
-{chr(10).join(f"{i+1}. {ref}" for i, ref in enumerate(blog.references))}
+    def finalize_post(self, content: str) -> str:
+        """Normalize raw model output into the published post format"""
+        if (content.lstrip().startswith('## ')
+                and all(h in content for h in _REQUIRED_HEADINGS)):
+            # The model followed the template; skip the parse/format round-trip
+            formatted_post = content.rstrip()
+            if 'Namaste,' not in formatted_post:
+                formatted_post += _SIGNATURE
+            return formatted_post
+        return self.format_blog_post(self.parse_response(content))
 
-Namaste,
-Jen Patel
-Founder, Soul Space"""
+    def format_blog_post(self, blog: YogaBlogPost) -> str:
+        """Format blog post in Soul Space style"""
+        parts = [
+            f"## {blog.title}\n\n### The Soul Space Perspective\n",
+            blog.perspective,
+            "\n\n### Understanding the Science\n",
+            blog.science,
+            "\n\n### Traditional Wisdom Meets Modern Research\n",
+            blog.integration,
+            "\n\n### Practical Applications\n",
+        ]
+        parts.extend(f"- {tip}\n" for tip in blog.applications)
+        parts.append("\n### Key Takeaways\n")
+        parts.extend(f"- {takeaway}\n" for takeaway in blog.takeaways)
+        parts.append("\n### Scientific References\n")
+        parts.extend(f"{i}. {ref}\n" for i, ref in enumerate(blog.references, 1))
+        parts.append("\nNamaste,\nJen Patel\nFounder, Soul Space")
+        return ''.join(parts)
 
     def run(self, topic: str, use_cache: bool = True) -> Iterator[RunResponse]:
         """Execute the blog post generation workflow"""
@@ -173,16 +281,23 @@ Founder, Soul Space"""
                 )
                 return
 
-        prompt = f"""Write a comprehensive blog post about {topic}.
-        Focus on both scientific evidence and yogic wisdom.
-        Include recent research and practical applications.
-        Follow the exact structure provided in the instructions."""
+        prompt = _blog_prompt(topic)
 
         try:
-            response = self.writer.run(prompt)
-            if response and response.content:
-                blog_post = self.parse_response(response.content)
-                formatted_post = self.format_blog_post(blog_post)
+            # Stream chunks as they arrive so the UI can render incrementally
+            buffer = []
+            for chunk in self.writer.run(prompt, stream=True):
+                if chunk.content:
+                    buffer.append(chunk.content)
+                    yield RunResponse(
+                        run_id=self.run_id,
+                        event=RunEvent.run_response,
+                        content=chunk.content
+                    )
+
+            content = ''.join(buffer)
+            if content:
+                formatted_post = self.finalize_post(content)
                 self.add_blog_post_to_cache(topic, formatted_post)
                 
                 yield RunResponse(
@@ -204,23 +319,68 @@ Founder, Soul Space"""
                 content=f"Error: {str(e)}"
             )
 
-def generate_blog_post(topic: str) -> str:
-    """Generate a blog post using the workflow"""
-    url_safe_topic = topic.lower().replace(" ", "-")
-    
-    blog_generator = YogaBlogGenerator(
+@st.cache_resource
+def _get_generator(url_safe_topic: str) -> "YogaBlogGenerator":
+    """Reuse one workflow (agent + storage) per topic across reruns"""
+    return YogaBlogGenerator(
         session_id=f"yoga-blog-{url_safe_topic}",
         storage=SqlWorkflowStorage(
             table_name="yoga_blog_workflows",
-            db_file="tmp/workflows.db",
+            db_file=_DB_FILE,
         ),
     )
 
+def generate_blog_post(topic: str, use_cache: bool = True) -> Iterator[str]:
+    """Stream a blog post, storing the finished version in session state"""
+    # A cache hit never needs the workflow or its storage, so peek first
+    if use_cache:
+        cached_post = YogaBlogGenerator.peek_cache(topic)
+        if cached_post:
+            st.session_state.current_blog = cached_post
+            yield cached_post
+            return
+
+    url_safe_topic = topic.lower().replace(" ", "-")
+
+    blog_generator = _get_generator(url_safe_topic)
+
     try:
-        for response in blog_generator.run(topic=topic, use_cache=True):
-            return response.content
+        streamed = False
+        for response in blog_generator.run(topic=topic, use_cache=use_cache):
+            if response.event == RunEvent.workflow_completed:
+                st.session_state.current_blog = response.content
+                # Cache hits skip streaming, so emit the full post at once
+                if not streamed and response.content:
+                    yield response.content
+            elif response.content:
+                streamed = True
+                yield response.content
     except Exception as e:
-        return f"Error generating blog post: {str(e)}"
+        yield f"Error generating blog post: {str(e)}"
+
+async def generate_blog_posts(topics: List[str]) -> List[str]:
+    """Generate posts for several topics concurrently, reusing the cache"""
+    writer = _get_writer()
+    finalizer = YogaBlogGenerator()
+
+    async def _one(topic: str) -> str:
+        cached_post = YogaBlogGenerator.peek_cache(topic)
+        if cached_post:
+            return cached_post
+        response = await writer.arun(_blog_prompt(topic))
+        if not (response and response.content):
+            return f"Failed to generate blog post about: {topic}"
+        formatted_post = finalizer.finalize_post(response.content)
+        _store_blog_post(_normalize_topic(topic), formatted_post)
+        return formatted_post
+
+    results = await asyncio.gather(
+        *(_one(topic) for topic in topics), return_exceptions=True
+    )
+    return [
+        f"Error generating blog post: {str(r)}" if isinstance(r, Exception) else r
+        for r in results
+    ]
 
 def main():
     st.set_page_config(
@@ -258,18 +418,34 @@ def main():
         )
         
         generate_button = st.button("Generate Blog Post", type="primary")
-        
-        if generate_button and topic:
-            with st.spinner("Generating your blog post..."):
-                blog_content = generate_blog_post(topic)
-                st.session_state.current_blog = blog_content
+
+        st.subheader("Batch Generate")
+        batch_topics = st.text_area(
+            "Enter one topic per line",
+            placeholder="Yoga Nidra for Deep Rest\nBreathwork for Focus",
+            key="batch_input"
+        )
+        batch_button = st.button("Generate All")
+
+        if batch_button and batch_topics:
+            topics = [t.strip() for t in batch_topics.splitlines() if t.strip()]
+            with st.spinner(f"Generating {len(topics)} blog posts..."):
+                posts = asyncio.run(generate_blog_posts(topics))
+            for batch_topic, post in zip(topics, posts):
+                with st.expander(batch_topic):
+                    st.markdown(post)
 
     with col2:
         st.subheader("Generated Content")
-        if "current_blog" in st.session_state:
+        if generate_button and topic:
+            st.write_stream(generate_blog_post(topic))
+        elif "current_blog" in st.session_state:
             st.markdown(st.session_state.current_blog)
-            
-            # Export options
+
+        if "current_blog" in st.session_state:
+            # Export options; only the filename needs datetime, so defer it
+            from datetime import datetime
+
             st.download_button(
                 label="Download as Markdown",
                 data=st.session_state.current_blog,